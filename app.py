@@ -9,14 +9,15 @@ import plotly.graph_objects as go
 st.set_page_config(page_title="Music & Mental Health", layout="wide")
 st.title("Music & Mental Health Survey Analysis (Interactive Dashboard)")
 
-#load dataset
-file_path = "https://raw.githubusercontent.com/mohidqadeer123/streamlit-tests/main/Dataset.csv"
-df = pd.read_csv(file_path)
+#load dataset (single source URL, so there is exactly one load_data cache entry)
+DATA_URL = "https://raw.githubusercontent.com/mohidqadeer123/streamlit-tests/main/Dataset.csv"
 
-#identify key columns
-health_cols = [c for c in df.columns if any(x in c for x in ["Anxiety", "Depression", "Insomnia", "OCD"])]
-genre_cols = [c for c in df.columns if c.startswith("Frequency [")]
-bpm_col = "BPM" if "BPM" in df.columns else None  # adjust if your BPM column name differs
+@st.cache_data(ttl=3600)
+def load_data(url):
+    #pyarrow's multithreaded parser; columns stay numpy-backed so the numpy code paths below are unchanged
+    return pd.read_csv(url, engine="pyarrow")
+
+df = load_data(DATA_URL)
 
 # Frequency map for listening type
 freq_map = {
@@ -26,107 +27,171 @@ freq_map = {
     "Very frequently": 3
 }
 
-genre_freq_cols = [col for col in df.columns if col.startswith("Frequency")]
-df[genre_freq_cols] = df[genre_freq_cols].replace(freq_map)
-df["active_genre_count"] = (df[genre_freq_cols] >= 2).sum(axis=1)
-df["listening_type"] = df["active_genre_count"].apply(lambda x: "Single" if x == 1 else "Multiple")
-
-#clean and prepare data
-df_clean = df.dropna(subset=health_cols + ["Hours per day", "Exploratory", "Music effects"])
-df_clean[genre_cols] = df_clean[genre_cols].apply(pd.to_numeric, errors="coerce")
-df_clean[health_cols] = df_clean[health_cols].apply(pd.to_numeric, errors="coerce")
-
-# add 'listening type' to df_clean
-if "listening_type" in df.columns:
-    df_clean["listening_type"] = df.loc[df_clean.index, "listening_type"]
-
-# Age groups
-df_clean['Age_Group'] = pd.cut(
-    df_clean['Age'],
-    bins=[0, 25, 40, 60, 100],
-    labels=['18-25', '26-40', '41-60', '60+'],
-    include_lowest=True
-)
-
-df_clean["Variety"] = (df_clean[genre_cols] > 0).sum(axis=1)
-df_clean["Avg_health"] = df_clean[health_cols].mean(axis=1)
-
-
-#sidebar filters
-st.sidebar.header("🧭 Filter Data")
-
-#hours per day filter
-min_hours, max_hours = int(df_clean["Hours per day"].min()), int(df_clean["Hours per day"].max())
-hours_range = st.sidebar.slider("🎚 Hours Listening per Day", min_hours, max_hours, (min_hours, max_hours))
-
-#avg mental health filter
-min_health, max_health = float(df_clean["Avg_health"].min()), float(df_clean["Avg_health"].max())
-health_range = st.sidebar.slider("🧠 Average Mental Health Score", min_health, max_health, (min_health, max_health))
-
-#bpm filter (only if it exists)
-if bpm_col and bpm_col in df_clean.columns:
-    bpm_min = int(df_clean[bpm_col].min())
-    bpm_max = int(min(df_clean[bpm_col].max(), 250))  # cap BPM at 250
-    bpm_range = st.sidebar.slider("🎵 BPM (Beats Per Minute)", bpm_min, bpm_max, (bpm_min, bpm_max))
-else:
-    bpm_range = None
-
-# --- Apply Filters ---
-filtered_df = df_clean[
-    (df_clean["Hours per day"].between(hours_range[0], hours_range[1])) &
-    (df_clean["Avg_health"].between(health_range[0], health_range[1]))
-].copy()
-
-if bpm_range and bpm_col:
-    filtered_df = filtered_df[filtered_df[bpm_col].between(bpm_range[0], bpm_range[1])]
-
-#formatting
-col1, col2 = st.columns(2)
+#bulk numeric cast of a column block; only falls back to coercing (strings -> NaN) if needed
+def to_float32(block):
+    try:
+        return block.astype(np.float32)
+    except (ValueError, TypeError):
+        coerced = pd.to_numeric(block.stack(), errors="coerce").unstack()
+        return coerced.reindex(index=block.index, columns=block.columns).astype(np.float32)
+
+#clean and prepare data (cached so slider moves skip the cleaning)
+@st.cache_data
+def prepare(df):
+    #identify key columns (done here so reruns reuse the cached lists)
+    health_cols = [c for c in df.columns if any(x in c for x in ["Anxiety", "Depression", "Insomnia", "OCD"])]
+    genre_cols = [c for c in df.columns if c.startswith("Frequency [")]
+    genre_freq_cols = [col for col in df.columns if col.startswith("Frequency")]
+    bpm_col = "BPM" if "BPM" in df.columns else None  # adjust if your BPM column name differs
+
+    df = df.copy()
+    df[genre_freq_cols] = df[genre_freq_cols].replace(freq_map)
+    freq_arr = df[genre_freq_cols].to_numpy(dtype=np.float32)
+    df["active_genre_count"] = (freq_arr >= 2).sum(axis=1, dtype=np.int32)
+    codes = (df["active_genre_count"].to_numpy() != 1).astype(np.int8)
+    df["listening_type"] = pd.Categorical.from_codes(codes, categories=["Single", "Multiple"])
+
+    df_clean = df.dropna(subset=health_cols + ["Hours per day", "Exploratory", "Music effects"]).copy()
+    df_clean[genre_cols] = to_float32(df_clean[genre_cols])
+    df_clean[health_cols] = to_float32(df_clean[health_cols])
+
+    #downcast: the 0-3 frequency scale fits in int8 (health scores have halves like 7.5, so stay float32)
+    if not df_clean[genre_cols].isna().any().any():
+        df_clean[genre_cols] = df_clean[genre_cols].astype(np.int8)
+    df_clean["Hours per day"] = df_clean["Hours per day"].astype(np.float32)
+    if bpm_col:
+        df_clean[bpm_col] = df_clean[bpm_col].astype(np.float32)
+
+    # add 'listening type' to df_clean
+    if "listening_type" in df.columns:
+        df_clean["listening_type"] = df.loc[df_clean.index, "listening_type"]
+
+    #categorical so the genre means can be accumulated by code without a groupby
+    df_clean["Fav genre"] = df_clean["Fav genre"].astype("category")
+
+    # Age groups
+    df_clean['Age_Group'] = pd.cut(
+        df_clean['Age'],
+        bins=[0, 25, 40, 60, 100],
+        labels=['18-25', '26-40', '41-60', '60+'],
+        include_lowest=True
+    )
 
-# 1. Hours Listening vs Mental Health
-with col1:
-    st.subheader("Hours Listening vs Mental Health")
+    genre_arr = df_clean[genre_cols].to_numpy()
+    df_clean["Variety"] = (genre_arr > 0).sum(axis=1, dtype=np.int32)
+    #health columns were dropna'd above, so a plain (non-skipna) numpy mean is safe
+    health_arr = df_clean[health_cols].to_numpy(dtype=np.float32)
+    df_clean["Avg_health"] = health_arr.mean(axis=1)
+
+    #row order sorted by hours, so the hours filter becomes a bisection instead of a full-column mask
+    hours_order = np.argsort(df_clean["Hours per day"].to_numpy(), kind="stable")
+    hours_sorted = df_clean["Hours per day"].to_numpy()[hours_order]
+
+    #content hash of the prepared data, part of every figure cache key (a refetch of
+    #identical content keeps its figures, changed content misses them)
+    data_key = int(pd.util.hash_pandas_object(df_clean).sum())
+    return df_clean, health_cols, bpm_col, hours_order, hours_sorted, data_key
+
+df_clean, health_cols, bpm_col, hours_order, hours_sorted, data_key = prepare(df)
+
+
+#per-group sums and counts keyed on category codes (one bincount pass per column, no groupby);
+#rows with a missing group (code -1) or any missing value are skipped
+def group_sums(codes, values, n_groups):
+    keep = (codes >= 0) & ~np.isnan(values).any(axis=1)
+    codes, values = codes[keep], values[keep]
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = np.column_stack([np.bincount(codes, weights=values[:, j], minlength=n_groups) for j in range(values.shape[1])])
+    return sums, counts
+
+#per-genre means of the health columns (a small numpy division over group_sums)
+def genre_means_table(df):
+    genres = df["Fav genre"].cat.categories
+    sums, counts = group_sums(df["Fav genre"].cat.codes.to_numpy(), df[health_cols].to_numpy(dtype=float), len(genres))
+    present = counts > 0
+
+    genre_means = pd.DataFrame(sums[present] / counts[present, None], columns=health_cols)
+    genre_means.insert(0, "Fav genre", np.asarray(genres)[present])
+    return genre_means
+
+#per-age-group means of the health columns plus average hours; empty groups stay as NaN rows
+def age_group_table(df):
+    groups = df["Age_Group"].cat.categories
+    values = df[health_cols + ["Hours per day"]].to_numpy(dtype=float)
+    sums, counts = group_sums(df["Age_Group"].cat.codes.to_numpy(), values, len(groups))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts[:, None]
+    return pd.DataFrame(means, index=pd.Index(groups, name="Age_Group"), columns=health_cols + ["Avg_Hours"])
+
+
+#cap on markers per scatter plot; trendlines are still fit on every row
+MAX_POINTS = 5000
+
+def sample_points(df):
+    return df if len(df) <= MAX_POINTS else df.sample(MAX_POINTS, random_state=0)
+
+
+#least-squares trendline (fit with numpy instead of px trendline="ols"/statsmodels)
+def add_trendline(fig, x, y, **trace_kwargs):
+    ok = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[ok], y[ok]
+    if len(x) < 2 or x.min() == x.max():
+        return
+    m, b = np.polyfit(x, y, 1)
+    fig.add_scatter(x=[x.min(), x.max()], y=[m*x.min()+b, m*x.max()+b], mode="lines", showlegend=False, **trace_kwargs)
+
+
+#cached figure builders, keyed on data_key plus the slider values (the filtered frame itself is not
+#hashed); max_entries bounds the store, since the health slider is a continuous range
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def build_fig1(_df, data_key, hours_range, health_range):
     fig1 = px.scatter(
-        filtered_df,
+        sample_points(_df),
         x="Hours per day",
         y="Avg_health",
-        trendline="ols",
         opacity=0.6,
+        render_mode="webgl",
         color_discrete_sequence=["#1f77b4"],
         labels={"Hours per day": "Hours Listening per Day", "Avg_health": "Average Mental Health Score"},
         title="Does listening longer affect mental health?"
     )
     fig1.update_traces(marker=dict(size=7))
-    st.plotly_chart(fig1, use_container_width=True)
-
-# 2. Exploratory vs Reported Music Effects
-with col2:
-    st.subheader("Exploring New Genres vs Reported Effects")
-    fig2 = px.histogram(
-        filtered_df,
-        x="Music effects",
-        color="Exploratory",
+    add_trendline(
+        fig1,
+        _df["Hours per day"].to_numpy(dtype=float),
+        _df["Avg_health"].to_numpy(dtype=float),
+        line_color="#1f77b4"
+    )
+    return fig1
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def build_fig2(_df, data_key, hours_range, health_range):
+    #count server-side and send only the (effect x exploratory) totals, in first-seen order like px
+    counts = _df.groupby(["Music effects", "Exploratory"]).size().unstack(fill_value=0)
+    counts = counts.reindex(index=pd.unique(_df["Music effects"]), columns=pd.unique(_df["Exploratory"]), fill_value=0)
+
+    fig2 = go.Figure()
+    for col in counts.columns:
+        fig2.add_bar(x=counts.index, y=counts[col], name=str(col), texttemplate="%{y}")
+    fig2.update_layout(
         barmode="group",
-        text_auto=True,
         title="Exploring new genres/artists vs reported effects on mental health",
-        labels={"Music effects": "Reported Effect of Music", "count": "Number of Respondents"}
+        xaxis_title="Reported Effect of Music",
+        yaxis_title="Number of Respondents",
+        legend_title_text="Exploratory",
+        xaxis_tickangle=20
     )
-    fig2.update_layout(xaxis_tickangle=20)
-    st.plotly_chart(fig2, use_container_width=True)
-
-# 3. BPM vs Mental Health (Scatter + Box Plot)
-st.subheader("🎚 Relationship Between BPM and Mental Health")
+    return fig2
 
-if bpm_col and bpm_col in filtered_df.columns:
-    #scatter plot
-    st.markdown("#### 🔹 Scatter: Does faster music correlate with better or worse mental health?")
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def build_fig3(_df, data_key, hours_range, health_range, bpm_range):
     fig3 = px.scatter(
-        filtered_df,
+        sample_points(_df),
         x=bpm_col,
         y="Avg_health",
         color="Exploratory",
-        trendline="ols",
         opacity=0.7,
+        render_mode="webgl",
         title="BPM (Beats Per Minute) vs Average Mental Health",
         labels={
             bpm_col: "Beats Per Minute (Preferred Tempo)",
@@ -136,131 +201,267 @@ if bpm_col and bpm_col in filtered_df.columns:
         color_discrete_sequence=px.colors.qualitative.Pastel
     )
     fig3.update_traces(marker=dict(size=8))
-    st.plotly_chart(fig3, use_container_width=True)
+    #one trendline per 'Exploratory' group, matching the marker colour
+    for trace in list(fig3.data):
+        group = _df[_df["Exploratory"] == trace.name]
+        add_trendline(
+            fig3,
+            group[bpm_col].to_numpy(dtype=float),
+            group["Avg_health"].to_numpy(dtype=float),
+            line_color=trace.marker.color,
+            legendgroup=trace.legendgroup
+        )
+    return fig3
 
-    #bpm bins from slowest to fastest
-    st.markdown("#### 🔹 Box Plot: Mental Health Across BPM Ranges")
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def build_fig4(_df, data_key, hours_range, health_range, bpm_range):
     num_bins = 5
-    try:
-        #quantile-based bins (limit to 250 BPM)
-        bins = np.quantile(filtered_df[bpm_col].dropna(), np.linspace(0, 1, num_bins + 1))
-        bins = np.clip(bins, None, 250)
-        bins = np.unique(bins)  # remove duplicates if small data variation
-        labels = [f"{int(bins[i])}-{int(bins[i+1])}" for i in range(len(bins) - 1)]
-
-        #cut and label by BPM ranges
-        filtered_df["BPM_Range"] = pd.cut(filtered_df[bpm_col], bins=bins, labels=labels, include_lowest=True)
-
-        #ensure order from slowest to fastest
-        filtered_df["BPM_Range"] = pd.Categorical(filtered_df["BPM_Range"], categories=labels, ordered=True)
-
-        #box plot
-        fig4 = px.box(
-            filtered_df.sort_values("BPM_Range"),
-            x="BPM_Range",
-            y="Avg_health",
-            color="BPM_Range",
-            title="Mental Health Scores Across BPM Ranges (Slow → Fast)",
-            labels={"BPM_Range": "Tempo Range (BPM)", "Avg_health": "Average Mental Health Score"},
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig4.update_layout(showlegend=False)
-        st.plotly_chart(fig4, use_container_width=True)
+    bpm = _df[bpm_col].to_numpy(dtype=float)
+    valid = ~np.isnan(bpm)
+    #quantile-based bins (limit to 250 BPM)
+    bins = np.quantile(bpm[valid], np.linspace(0, 1, num_bins + 1))
+    bins = np.clip(bins, None, 250)
+    bins = np.unique(bins)  # remove duplicates if small data variation
+    if len(bins) < 2:
+        raise ValueError("not enough distinct BPM values to bin")
+    labels = [f"{int(bins[i])}-{int(bins[i+1])}" for i in range(len(bins) - 1)]
+
+    #bin codes via bisection on the inner edges (right-closed like pd.cut, lowest edge included);
+    #missing or out-of-range BPM gets code -1, i.e. NaN in the Categorical
+    codes = np.searchsorted(bins[1:-1], bpm, side="left")
+    codes[~valid | (bpm < bins[0]) | (bpm > bins[-1])] = -1
+
+    #label by BPM ranges (a new two-column frame; the input is never mutated)
+    keep = codes >= 0
+    box_df = pd.DataFrame({
+        "BPM_Range": pd.Categorical.from_codes(codes[keep], categories=labels, ordered=True),
+        "Avg_health": _df["Avg_health"].to_numpy()[keep]
+    })
+
+    #box plot; category_orders fixes slowest -> fastest, so the rows need no sort
+    fig4 = px.box(
+        box_df,
+        x="BPM_Range",
+        y="Avg_health",
+        color="BPM_Range",
+        category_orders={"BPM_Range": labels},
+        title="Mental Health Scores Across BPM Ranges (Slow → Fast)",
+        labels={"BPM_Range": "Tempo Range (BPM)", "Avg_health": "Average Mental Health Score"},
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig4.update_layout(showlegend=False)
+    return fig4
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def build_fig5(_genre_means, data_key, hours_range, health_range):
+    fig5 = px.bar(_genre_means, 
+              x="Fav genre", 
+              y=health_cols, 
+              barmode="group",
+            title="Average Mental Health Scores vs Fav Genre",
+            labels={"value": "Average Mental Health Score", "Fav genre": "Music Genre"},
+            color_discrete_sequence=px.colors.qualitative.Vivid
+    )
+    fig5.update_layout(xaxis_tickangle=-45)
+    return fig5
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def build_fig6(_subset, data_key, hours_range, health_range):
+    #box stats computed here (quartiles + 1.5*IQR whisker fences, as px.box does in the browser),
+    #so only a handful of numbers per (listening type, condition) are sent instead of every row
+    types = _subset["listening_type"].cat.categories
+    codes = _subset["listening_type"].cat.codes.to_numpy()
+    values = _subset[health_cols].to_numpy(dtype=float)
+    present = pd.unique(codes)  # first-seen order, as px.box drew the x categories
+
+    fig6 = go.Figure()
+    for j, cond in enumerate(health_cols):
+        q1, median, q3, lowerfence, upperfence = [], [], [], [], []
+        for k in present:
+            vals = values[codes == k, j]
+            lo, med, hi = np.quantile(vals, [0.25, 0.5, 0.75], method="hazen")  # Plotly.js's p*n - 0.5 rule
+            iqr = hi - lo
+            q1.append(lo)
+            median.append(med)
+            q3.append(hi)
+            lowerfence.append(vals[vals >= lo - 1.5 * iqr].min())
+            upperfence.append(vals[vals <= hi + 1.5 * iqr].max())
+        fig6.add_trace(go.Box(
+            name=cond,
+            x=[types[k] for k in present],
+            q1=q1, median=median, q3=q3,
+            lowerfence=lowerfence, upperfence=upperfence
+        ))
+    fig6.update_layout(
+        boxmode="group",
+        title="Mental Health Outcomes: Single vs Multi-Genre Listeners",
+        xaxis_title="Listening Style",
+        yaxis_title="Score",
+        legend_title_text="Condition"
+    )
+    return fig6
+
 
-    except Exception as e:
-        st.warning(f"⚠️ Could not compute BPM bins: {e}")
+#page sections (each rendered exactly once per run; filters is the (data_key, hours, health) cache key tuple)
+def render_hours_vs_health(df, filters):
+    st.subheader("Hours Listening vs Mental Health")
+    fig1 = build_fig1(df, *filters)
+    st.plotly_chart(fig1, use_container_width=True)
 
-else:
-    st.info("⚠️ BPM data not found in this dataset.")
+def render_exploratory(df, filters):
+    st.subheader("Exploring New Genres vs Reported Effects")
+    fig2 = build_fig2(df, *filters)
+    st.plotly_chart(fig2, use_container_width=True)
 
-# Average Mental Health by Fav Genre
-if not filtered_df.empty:
-    genre_subset = filtered_df[["Fav genre"] + health_cols].dropna()
-    if not genre_subset.empty:
-        genre_means = genre_subset.groupby("Fav genre")[health_cols].mean().reset_index()
+#fragment: moving the BPM slider reruns only this section, not the load/clean/other charts
+@st.fragment
+def render_bpm(df, filters):
+    st.subheader("🎚 Relationship Between BPM and Mental Health")
+
+    if bpm_col and bpm_col in df.columns:
+        #bpm sub-range (bounds from the full dataset so the slider stays stable)
+        bpm_range = st.slider("🎵 BPM (Beats Per Minute)", bpm_min, bpm_max, (bpm_min, bpm_max))
+        bpm = df[bpm_col].to_numpy()
+        bpm_df = df.loc[(bpm >= bpm_range[0]) & (bpm <= bpm_range[1]), [bpm_col, "Avg_health", "Exploratory"]]
+
+        #scatter plot
+        st.markdown("#### 🔹 Scatter: Does faster music correlate with better or worse mental health?")
+        fig3 = build_fig3(bpm_df, *filters, bpm_range)
+        st.plotly_chart(fig3, use_container_width=True)
+
+        #bpm bins from slowest to fastest
+        st.markdown("#### 🔹 Box Plot: Mental Health Across BPM Ranges")
+        try:
+            fig4 = build_fig4(bpm_df, *filters, bpm_range)
+            st.plotly_chart(fig4, use_container_width=True)
+
+        except Exception as e:
+            st.warning(f"⚠️ Could not compute BPM bins: {e}")
+
+    else:
+        st.info("⚠️ BPM data not found in this dataset.")
+
+def render_genre(df, filters):
+    if df.empty:
+        return
+    genre_means = genre_means_table(df)
+    if not genre_means.empty:
         genre_means["avg_score"] = genre_means[health_cols].mean(axis=1)
         genre_means = genre_means.sort_values("avg_score")
         
         # Bar Plot
         st.subheader("🎚 Relationship of Average mental health with Favourite Genre and Listening style")
         st.markdown("### 📊 : Which music genre seems to be the best to fight depression?")
-        fig5 = px.bar(genre_means, 
-                  x="Fav genre", 
-                  y=health_cols, 
-                  barmode="group",
-                title="Average Mental Health Scores vs Fav Genre",
-                labels={"value": "Average Mental Health Score", "Fav genre": "Music Genre"},
-                color_discrete_sequence=px.colors.qualitative.Vivid
-        )
-        fig5.update_layout(xaxis_tickangle=-45)
+        fig5 = build_fig5(genre_means, *filters)
         st.plotly_chart(fig5, use_container_width=True)
     else:
         print("⚠️ No genre data available after filtering.")
 
-
-# Average Mental Health vs Listening Type
-if "listening_type" in filtered_df.columns:
-    subset = filtered_df[["listening_type"] + health_cols].dropna()
-    if not subset.empty:
-        mh_melted = subset.melt(
-                id_vars="listening_type",
-                value_vars=health_cols,
-                var_name="Condition", value_name="Score"
+def render_listening_type(df, filters):
+    if "listening_type" in df.columns:
+        subset = df[["listening_type"] + health_cols].dropna()
+        if not subset.empty:
+            # Whisker Plot
+            st.markdown("### 📊 : Do people who spend more time listening to a single favorite genre report different mental health outcomes compared to those who spread their time across multiple genres? ")
+            fig6 = build_fig6(subset, *filters)
+            st.plotly_chart(fig6, use_container_width=True)
+        else:
+            st.warning("⚠️ No data for listening type comparison after filtering.")
+    else:
+        st.warning("⚠️ 'listening_type' not found in filtered dataset.")
+
+def render_age_heatmap(df, filters):
+    if not df.empty:
+        age_group_summary = age_group_table(df)
+
+        # Heatmap
+        st.subheader("🎚 Relationship of Average mental health with Age Group and Listening hours")
+        st.markdown("### 🌈 : How do daily music listening habits influence average mental health scores across different age groups?")
+
+        fig7 = go.Figure(
+        data=go.Heatmap(
+            z=age_group_summary.values,
+            x=age_group_summary.columns,
+            y=age_group_summary.index,
+            colorscale="RdBu", 
+            reversescale=True,
+            texttemplate="%{z:.2f}",  # format z client-side instead of shipping a rounded copy as text
+            textfont={"size": 12},
+            hovertemplate="Age Group: %{y}<br>%{x}: %{z:.2f}<extra></extra>")
         )
-        # Whisker Plot
-        st.markdown("### 📊 : Do people who spend more time listening to a single favorite genre report different mental health outcomes compared to those who spread their time across multiple genres? ")
-        fig6 = px.box(mh_melted,
-                x="listening_type", 
-                y="Score", 
-                color="Condition",
-                title="Mental Health Outcomes: Single vs Multi-Genre Listeners",
-                labels={"listening_type": "Listening Style"}
+
+        fig7.update_layout(
+        title="Average Mental Health Scores by Age Group (Filtered by Hours per Day)",
+        xaxis_title="Mental Health Conditions + Avg Hours",
+        yaxis_title="Age Group",
+        yaxis=dict(autorange="reversed"),  # keep order like seaborn
+        height=400,
+        margin=dict(l=60, r=20, t=60, b=40)
         )
-        st.plotly_chart(fig6, use_container_width=True)
+
+        st.plotly_chart(fig7, use_container_width=True)
     else:
-        st.warning("⚠️ No data for listening type comparison after filtering.")
-else:
-    st.warning("⚠️ 'listening_type' not found in filtered dataset.")
+        st.warning("⚠️ No data available for the selected hours range.")
 
 
-# Average mental health scores vs age group
-if not filtered_df.empty:
-    age_group_summary = filtered_df.groupby('Age_Group')[health_cols].mean()
-    age_group_summary['Avg_Hours'] = filtered_df.groupby('Age_Group')["Hours per day"].mean()
-
-    # Heatmap
-    st.subheader("🎚 Relationship of Average mental health with Age Group and Listening hours")
-    st.markdown("### 🌈 : How do daily music listening habits influence average mental health scores across different age groups?")
-
-    fig7 = go.Figure(
-    data=go.Heatmap(
-        z=age_group_summary.values,
-        x=age_group_summary.columns,
-        y=age_group_summary.index,
-        colorscale="RdBu", 
-        reversescale=True,
-        text=np.round(age_group_summary.values, 2),
-        texttemplate="%{text}",
-        textfont={"size": 12},
-        hovertemplate="Age Group: %{y}<br>%{x}: %{z:.2f}<extra></extra>")
-    )
+#columns read by the charts below; filtering projects onto these instead of copying the whole frame
+plot_cols = ["Hours per day", "Avg_health", "Exploratory", "Music effects", "Fav genre", "listening_type", "Age_Group"] + health_cols
+if bpm_col:
+    plot_cols.append(bpm_col)
 
-    fig7.update_layout(
-    title="Average Mental Health Scores by Age Group (Filtered by Hours per Day)",
-    xaxis_title="Mental Health Conditions + Avg Hours",
-    yaxis_title="Age Group",
-    yaxis=dict(autorange="reversed"),  # keep order like seaborn
-    height=400,
-    margin=dict(l=60, r=20, t=60, b=40)
-    )
+#bpm slider bounds; the page-wide filter below keeps rows inside them, the chosen sub-range is local to render_bpm
+if bpm_col:
+    bpm_min = int(df_clean[bpm_col].min())
+    bpm_max = int(min(df_clean[bpm_col].max(), 250))  # cap BPM at 250
 
-    st.plotly_chart(fig7, use_container_width=True)
-else:
-    st.warning("⚠️ No data available for the selected hours range.")
 
-    
-        
+#sidebar filters
+st.sidebar.header("🧭 Filter Data")
+
+#hours per day filter
+min_hours, max_hours = int(df_clean["Hours per day"].min()), int(df_clean["Hours per day"].max())
+hours_range = st.sidebar.slider("🎚 Hours Listening per Day", min_hours, max_hours, (min_hours, max_hours))
+
+#avg mental health filter
+min_health, max_health = float(df_clean["Avg_health"].min()), float(df_clean["Avg_health"].max())
+health_range = st.sidebar.slider("🧠 Average Mental Health Score", min_health, max_health, (min_health, max_health))
+
+# --- Apply Filters ---
+#hours slice from the presorted index, then the health predicate on that slice only
+lo = np.searchsorted(hours_sorted, hours_range[0], side="left")
+hi = np.searchsorted(hours_sorted, hours_range[1], side="right")
+rows = hours_order[lo:hi]
+health = df_clean["Avg_health"].to_numpy()[rows]
+rows = rows[(health >= health_range[0]) & (health <= health_range[1])]
+#fixed BPM filter at the slider's default bounds: drops missing and impossible tempos (e.g. 999999999)
+#from every chart, as the page-wide BPM slider did at its default
+if bpm_col:
+    bpm = df_clean[bpm_col].to_numpy()[rows]
+    rows = rows[(bpm >= bpm_min) & (bpm <= bpm_max)]
+#one take of just the columns the charts read (original row order kept for the plots), no extra .copy()
+filtered_df = df_clean.iloc[np.sort(rows), df_clean.columns.get_indexer(plot_cols)]
+
+filters = (data_key, hours_range, health_range)
+
+#formatting
+col1, col2 = st.columns(2)
+
+# 1. Hours Listening vs Mental Health
+with col1:
+    render_hours_vs_health(filtered_df, filters)
+
+# 2. Exploratory vs Reported Music Effects
+with col2:
+    render_exploratory(filtered_df, filters)
 
+# 3. BPM vs Mental Health (Scatter + Box Plot)
+render_bpm(filtered_df, filters)
 
+# Average Mental Health by Fav Genre
+render_genre(filtered_df, filters)
 
+# Average Mental Health vs Listening Type
+render_listening_type(filtered_df, filters)
 
+# Average mental health scores vs age group
+render_age_heatmap(filtered_df, filters)